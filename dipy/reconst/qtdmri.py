@@ -1453,7 +1453,7 @@ def angular_basis_EAP_opt(j, l, m, r, theta, phi):
 def temporal_basis(o, ut, tau):
     """ Temporal basis dependent on temporal scaling factor ut
     """
-    const = np.exp(-ut * tau / 2.0) * special.laguerre(o)(ut * tau)
+    const = np.exp(-ut * tau / 2.0) * special.eval_laguerre(o, ut * tau)
     return const
 
 
@@ -1,7 +1,7 @@
+import inspect
 import warnings
 
 import numpy as np
-import scipy.integrate as integrate
 
 from numpy.testing import (assert_,
                            assert_almost_equal,
@@ -13,7 +13,7 @@ from dipy.core.gradients import gradient_table_from_qvals_bvecs
 from dipy.data import get_gtab_taiwan_dsi, get_sphere
 from dipy.reconst import qtdmri, mapmri
 from dipy.reconst.shm import descoteaux07_legacy_msg
-from dipy.sims.voxel import multi_tensor, add_noise
+from dipy.sims.voxel import multi_tensor
 
 needs_cvxpy = pytest.mark.skipif(not qtdmri.have_cvxpy,
                                  reason="REQUIRES CVXPY")
@@ -24,10 +24,8 @@ def generate_gtab4D(number_of_tau_shells=4, delta=0.01):
     gtab = get_gtab_taiwan_dsi()
     qvals = np.tile(gtab.bvals / 100., number_of_tau_shells)
     bvecs = np.tile(gtab.bvecs, (number_of_tau_shells, 1))
-    pulse_separation = []
-    for ps in np.linspace(0.02, 0.05, number_of_tau_shells):
-        pulse_separation = np.append(pulse_separation,
-                                     np.tile(ps, gtab.bvals.shape[0]))
+    pulse_separation = np.repeat(np.linspace(0.02, 0.05, number_of_tau_shells),
+                                 gtab.bvals.shape[0])
     pulse_duration = np.tile(delta, qvals.shape[0])
     gtab_4d = gradient_table_from_qvals_bvecs(qvals=qvals, bvecs=bvecs,
                                               big_delta=pulse_separation,
@@ -36,17 +34,88 @@ def generate_gtab4D(number_of_tau_shells=4, delta=0.01):
     return gtab_4d
 
 
-def generate_signal_crossing(gtab, lambda1, lambda2, lambda3, angle2=60):
+def generate_signal_crossings(gtab, lambda1, lambda2, lambda3, angles2=(60,)):
+    """Generates one crossing signal per angle of the second fiber, stacked
+    in an array of shape (len(angles2), number of gradients)"""
     mevals = np.array(([lambda1, lambda2, lambda3],
                        [lambda1, lambda2, lambda3]))
-    angl = [(0, 0), (angle2, 0)]
-    S, _ = multi_tensor(gtab, mevals, S0=1.0, angles=angl,
-                        fractions=[50, 50], snr=None)
-    return S
+    return np.stack([multi_tensor(gtab, mevals, S0=1.0,
+                                  angles=[(0, 0), (angle2, 0)],
+                                  fractions=[50, 50], snr=None)[0]
+                     for angle2 in angles2])
+
+
+def generate_signal_crossing(gtab, lambda1, lambda2, lambda3, angle2=60):
+    return generate_signal_crossings(gtab, lambda1, lambda2, lambda3,
+                                     angles2=(angle2,))[0]
+
+
+# Object to hold module global data
+class _C(object):
+    pass
+data = _C()
+
+
+def setup_module():
+    """Generate the qt-scheme, synthetic signals and evaluation grids shared
+    by the tests"""
+    global data
+    data.gtab_4d = generate_gtab4D()
+    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
+    data.S = generate_signal_crossing(data.gtab_4d, l1, l2, l3)
+    # fixed Gaussian noise realization (SNR 10) for the tests of the weight
+    # selection
+    rng = np.random.RandomState(1234)
+    data.S_noise = data.S + rng.normal(0, 0.1, size=data.S.shape)
+    data.rt_grid = qtdmri.create_rt_space_grid(5, 20e-3, 5, 0.02, .05)
+    data.sphere = get_sphere()
+    # the shared arrays are read-only so that no test can modify the data
+    # seen by the others, whatever order or process the tests run in
+    for arr in (data.S, data.S_noise, data.rt_grid):
+        arr.setflags(write=False)
+    data.models = {}
+    data.fits = {}
+
+
+def qtdmri_model_key(**kwargs):
+    """Key of a QtdmriModel configuration, with the default arguments filled
+    in so that equivalent configurations share the same key"""
+    arguments = inspect.signature(qtdmri.QtdmriModel).bind(None, **kwargs)
+    arguments.apply_defaults()
+    del arguments.arguments['gtab']
+    return tuple(sorted(arguments.arguments.items()))
+
+
+def get_qtdmri_model(**kwargs):
+    """Returns a QtdmriModel of the shared qt-scheme, reusing the instance
+    previously built with the same configuration"""
+    key = qtdmri_model_key(**kwargs)
+    if key not in data.models:
+        data.models[key] = qtdmri.QtdmriModel(data.gtab_4d, **kwargs)
+    return data.models[key]
+
+
+def get_qtdmri_fit(signal, **kwargs):
+    """Returns the fit of one of the shared signals with the QtdmriModel built
+    from kwargs, reusing the fit previously computed for the same signal and
+    model configuration"""
+    key = (id(signal),) + qtdmri_model_key(**kwargs)
+    if key not in data.fits:
+        data.fits[key] = get_qtdmri_model(**kwargs).fit(signal)
+    return data.fits[key]
+
+
+def get_unregularized_fit(**kwargs):
+    """Returns the fit of the shared synthetic signal with zero
+    regularization weight, reused as reference by the regularization tests.
+    With zero weight the Laplacian and l1 regularized problems reduce to the
+    same constrained least squares, so one fit serves both"""
+    return get_qtdmri_fit(data.S, laplacian_regularization=True,
+                          laplacian_weighting=0., **kwargs)
 
 
 def test_input_parameters():
-    gtab_4d = generate_gtab4D()
+    gtab_4d = data.gtab_4d
 
     # uneven radial order
     assert_raises(ValueError, qtdmri.QtdmriModel, gtab_4d, radial_order=3)
@@ -114,78 +183,50 @@ def test_input_parameters():
                   normalization=False)
 
 
+def temporal_basis_gram_matrix(ut, max_order=5, number_of_nodes=10):
+    """Computes the inner products of the temporal basis functions up to
+    max_order using Gauss-Laguerre quadrature on [0, inf)"""
+    x, w = np.polynomial.laguerre.laggauss(number_of_nodes)
+    # the basis functions already contain the exp(-ut * tau) weight, so it
+    # is removed from the quadrature weights
+    tau = x / ut
+    weights = w * np.exp(x) / ut
+    basis = np.array([qtdmri.temporal_basis(o, ut, tau)
+                      for o in range(max_order + 1)])
+    return np.dot(basis * weights, basis.T)
+
+
 def test_orthogonality_temporal_basis_functions():
-    # numerical integration parameters
     ut = 10
-    tmin = 0
-    tmax = 100
-
-    int1 = integrate.quad(lambda t:
-                          qtdmri.temporal_basis(1, ut, t) *
-                          qtdmri.temporal_basis(2, ut, t), tmin, tmax)
-    int2 = integrate.quad(lambda t:
-                          qtdmri.temporal_basis(2, ut, t) *
-                          qtdmri.temporal_basis(3, ut, t), tmin, tmax)
-    int3 = integrate.quad(lambda t:
-                          qtdmri.temporal_basis(3, ut, t) *
-                          qtdmri.temporal_basis(4, ut, t), tmin, tmax)
-    int4 = integrate.quad(lambda t:
-                          qtdmri.temporal_basis(4, ut, t) *
-                          qtdmri.temporal_basis(5, ut, t), tmin, tmax)
-
-    assert_almost_equal(int1, 0.)
-    assert_almost_equal(int2, 0.)
-    assert_almost_equal(int3, 0.)
-    assert_almost_equal(int4, 0.)
+    gram = temporal_basis_gram_matrix(ut)
+    off_diagonal = gram - np.diag(np.diag(gram))
+    assert_array_almost_equal(off_diagonal, np.zeros_like(gram))
 
 
 def test_normalization_time():
     ut = 10
-    tmin = 0
-    tmax = 100
-
-    int0 = integrate.quad(lambda t:
-                          qtdmri.qtdmri_temporal_normalization(ut) ** 2 *
-                          qtdmri.temporal_basis(0, ut, t) *
-                          qtdmri.temporal_basis(0, ut, t), tmin, tmax)[0]
-    int1 = integrate.quad(lambda t:
-                          qtdmri.qtdmri_temporal_normalization(ut) ** 2 *
-                          qtdmri.temporal_basis(1, ut, t) *
-                          qtdmri.temporal_basis(1, ut, t), tmin, tmax)[0]
-    int2 = integrate.quad(lambda t:
-                          qtdmri.qtdmri_temporal_normalization(ut) ** 2 *
-                          qtdmri.temporal_basis(2, ut, t) *
-                          qtdmri.temporal_basis(2, ut, t), tmin, tmax)[0]
-
-    assert_almost_equal(int0, 1.)
-    assert_almost_equal(int1, 1.)
-    assert_almost_equal(int2, 1.)
+    gram = temporal_basis_gram_matrix(ut)
+    norm_squared = qtdmri.qtdmri_temporal_normalization(ut) ** 2
+    assert_array_almost_equal(norm_squared * np.diag(gram),
+                              np.ones(gram.shape[0]))
 
 
 def test_anisotropic_isotropic_equivalence(radial_order=4, time_order=2):
-    # generate qt-scheme and arbitrary synthetic crossing data.
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-
-    # initialize both cartesian and spherical models without any kind of
-    # regularization
-    qtdmri_mod_aniso = qtdmri.QtdmriModel(gtab_4d, radial_order=radial_order,
-                                          time_order=time_order,
-                                          cartesian=True,
-                                          anisotropic_scaling=False)
-    qtdmri_mod_iso = qtdmri.QtdmriModel(gtab_4d, radial_order=radial_order,
-                                        time_order=time_order,
-                                        cartesian=False,
-                                        anisotropic_scaling=False)
-
-    # both implementations fit the same signal
+    # qt-scheme and arbitrary synthetic crossing data.
+    S = data.S
+
+    # both cartesian and spherical implementations fit the same signal
+    # without any kind of regularization
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
-        qtdmri_fit_cart = qtdmri_mod_aniso.fit(S)
-        qtdmri_fit_sphere = qtdmri_mod_iso.fit(S)
+        qtdmri_fit_cart = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            cartesian=True, anisotropic_scaling=False)
+        qtdmri_fit_sphere = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            cartesian=False, anisotropic_scaling=False)
 
     # same signal fit
     with warnings.catch_warnings():
@@ -196,38 +237,40 @@ def test_anisotropic_isotropic_equivalence(radial_order=4, time_order=2):
                                   qtdmri_fit_sphere.fitted_signal())
 
     # same PDF reconstruction
-    rt_grid = qtdmri.create_rt_space_grid(5, 20e-3, 5, 0.02, .05)
+    rt_grid = data.rt_grid
     pdf_aniso = qtdmri_fit_cart.pdf(rt_grid)
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
         pdf_iso = qtdmri_fit_sphere.pdf(rt_grid)
-    assert_array_almost_equal(pdf_aniso / pdf_aniso.max(),
-                              pdf_iso / pdf_aniso.max())
+    assert_array_almost_equal(pdf_aniso, pdf_iso)
 
     # same norm of the Laplacian
     norm_laplacian_aniso = qtdmri_fit_cart.norm_of_laplacian_signal()
     norm_laplacian_iso = qtdmri_fit_sphere.norm_of_laplacian_signal()
-    assert_almost_equal(norm_laplacian_aniso / norm_laplacian_aniso,
-                        norm_laplacian_iso / norm_laplacian_aniso)
+    assert_almost_equal(norm_laplacian_aniso, norm_laplacian_iso)
 
     # all q-space index is the same for arbitrary tau
     tau = 0.02
-    assert_almost_equal(qtdmri_fit_cart.rtop(tau), qtdmri_fit_sphere.rtop(tau))
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
-        assert_almost_equal(
-            qtdmri_fit_cart.rtap(tau), qtdmri_fit_sphere.rtap(tau))
-        assert_almost_equal(
-            qtdmri_fit_cart.rtpp(tau), qtdmri_fit_sphere.rtpp(tau))
-    assert_almost_equal(qtdmri_fit_cart.msd(tau), qtdmri_fit_sphere.msd(tau))
-    assert_almost_equal(qtdmri_fit_cart.qiv(tau), qtdmri_fit_sphere.qiv(tau))
+        indices_cart = np.array([qtdmri_fit_cart.rtop(tau),
+                                 qtdmri_fit_cart.rtap(tau),
+                                 qtdmri_fit_cart.rtpp(tau),
+                                 qtdmri_fit_cart.msd(tau),
+                                 qtdmri_fit_cart.qiv(tau)])
+        indices_sphere = np.array([qtdmri_fit_sphere.rtop(tau),
+                                   qtdmri_fit_sphere.rtap(tau),
+                                   qtdmri_fit_sphere.rtpp(tau),
+                                   qtdmri_fit_sphere.msd(tau),
+                                   qtdmri_fit_sphere.qiv(tau)])
+    assert_array_almost_equal(indices_cart, indices_sphere, decimal=7)
 
     # ODF estimation is the same
-    sphere = get_sphere()
+    sphere = data.sphere
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
@@ -237,99 +280,72 @@ def test_anisotropic_isotropic_equivalence(radial_order=4, time_order=2):
 
 
 def test_cartesian_normalization(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-
-    qtdmri_mod_aniso = qtdmri.QtdmriModel(gtab_4d, radial_order=radial_order,
-                                          time_order=time_order,
-                                          cartesian=True,
-                                          normalization=False)
-    qtdmri_mod_aniso_norm = qtdmri.QtdmriModel(gtab_4d,
-                                               radial_order=radial_order,
-                                               time_order=time_order,
-                                               cartesian=True,
-                                               normalization=True)
-    qtdmri_fit_aniso = qtdmri_mod_aniso.fit(S)
-    qtdmri_fit_aniso_norm = qtdmri_mod_aniso_norm.fit(S)
+    S = data.S
+
+    qtdmri_fit_aniso = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order, cartesian=True,
+        normalization=False)
+    qtdmri_fit_aniso_norm = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order, cartesian=True,
+        normalization=True)
     assert_array_almost_equal(qtdmri_fit_aniso.fitted_signal(),
                               qtdmri_fit_aniso_norm.fitted_signal())
-    rt_grid = qtdmri.create_rt_space_grid(5, 20e-3, 5, 0.02, .05)
+    rt_grid = data.rt_grid
     pdf_aniso = qtdmri_fit_aniso.pdf(rt_grid)
     pdf_aniso_norm = qtdmri_fit_aniso_norm.pdf(rt_grid)
-    assert_array_almost_equal(pdf_aniso / pdf_aniso.max(),
-                              pdf_aniso_norm / pdf_aniso.max())
+    assert_array_almost_equal(pdf_aniso, pdf_aniso_norm)
     norm_laplacian = qtdmri_fit_aniso.norm_of_laplacian_signal()
     norm_laplacian_norm = qtdmri_fit_aniso_norm.norm_of_laplacian_signal()
-    assert_array_almost_equal(norm_laplacian / norm_laplacian,
-                              norm_laplacian_norm / norm_laplacian)
+    assert_almost_equal(norm_laplacian, norm_laplacian_norm)
 
 
 def test_spherical_normalization(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-
-    qtdmri_mod_aniso = qtdmri.QtdmriModel(gtab_4d, radial_order=radial_order,
-                                          time_order=time_order,
-                                          cartesian=False,
-                                          normalization=False)
-    qtdmri_mod_aniso_norm = qtdmri.QtdmriModel(gtab_4d,
-                                               radial_order=radial_order,
-                                               time_order=time_order,
-                                               cartesian=False,
-                                               normalization=True)
+    S = data.S
+
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
-        qtdmri_fit = qtdmri_mod_aniso.fit(S)
-        qtdmri_fit_norm = qtdmri_mod_aniso_norm.fit(S)
+        qtdmri_fit = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            cartesian=False, normalization=False)
+        qtdmri_fit_norm = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            cartesian=False, normalization=True)
         assert_array_almost_equal(qtdmri_fit.fitted_signal(),
                                   qtdmri_fit_norm.fitted_signal())
 
-    rt_grid = qtdmri.create_rt_space_grid(5, 20e-3, 5, 0.02, .05)
+    rt_grid = data.rt_grid
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
         pdf = qtdmri_fit.pdf(rt_grid)
         pdf_norm = qtdmri_fit_norm.pdf(rt_grid)
-    assert_array_almost_equal(pdf / pdf.max(),
-                              pdf_norm / pdf.max())
+    assert_array_almost_equal(pdf, pdf_norm)
 
     norm_laplacian = qtdmri_fit.norm_of_laplacian_signal()
     norm_laplacian_norm = qtdmri_fit_norm.norm_of_laplacian_signal()
-    assert_array_almost_equal(norm_laplacian / norm_laplacian,
-                              norm_laplacian_norm / norm_laplacian)
+    assert_almost_equal(norm_laplacian, norm_laplacian_norm)
 
 
 def test_anisotropic_reduced_MSE(radial_order=0, time_order=0):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-    qtdmri_mod_aniso = qtdmri.QtdmriModel(gtab_4d, radial_order=radial_order,
-                                          time_order=time_order,
-                                          cartesian=True,
-                                          anisotropic_scaling=True)
-    qtdmri_mod_iso = qtdmri.QtdmriModel(gtab_4d, radial_order=radial_order,
-                                        time_order=time_order,
-                                        cartesian=True,
-                                        anisotropic_scaling=False)
-    qtdmri_fit_aniso = qtdmri_mod_aniso.fit(S)
-    qtdmri_fit_iso = qtdmri_mod_iso.fit(S)
+    S = data.S
+    qtdmri_fit_aniso = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order, cartesian=True,
+        anisotropic_scaling=True)
+    qtdmri_fit_iso = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order, cartesian=True,
+        anisotropic_scaling=False)
     mse_aniso = np.mean((S - qtdmri_fit_aniso.fitted_signal()) ** 2)
     mse_iso = np.mean((S - qtdmri_fit_iso.fitted_signal()) ** 2)
     assert_(mse_aniso < mse_iso)
 
 
 def test_number_of_coefficients(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-    qtdmri_mod = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order)
-    qtdmri_fit = qtdmri_mod.fit(S)
+    S = data.S
+    qtdmri_fit = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order)
     number_of_coef_model = qtdmri_fit._qtdmri_coef.shape[0]
     number_of_coef_analytic = qtdmri.qtdmri_number_of_coefficients(
         radial_order, time_order
@@ -380,16 +396,13 @@ def test_calling_spherical_laplacian_with_precomputed_matrices(
 
 @needs_cvxpy
 def test_q0_constraint_and_unity_of_ODFs(radial_order=6, time_order=2):
-    gtab_4d = generate_gtab4D()
+    gtab_4d = data.gtab_4d
     tau = gtab_4d.tau
+    S = data.S
 
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
     # first test without regularization
-    qtdmri_mod_ls = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order
-    )
-    qtdmri_fit_ls = qtdmri_mod_ls.fit(S)
+    qtdmri_fit_ls = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order)
     fitted_signal = qtdmri_fit_ls.fitted_signal()
     # only first tau_point is normalized with least squares.
     E_q0_first_tau = fitted_signal[
@@ -398,11 +411,9 @@ def test_q0_constraint_and_unity_of_ODFs(radial_order=6, time_order=2):
     assert_almost_equal(float(E_q0_first_tau), 1.)
 
     # now with cvxpy regularization cartesian
-    qtdmri_mod_lap = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        laplacian_regularization=True, laplacian_weighting=1e-4
-    )
-    qtdmri_fit_lap = qtdmri_mod_lap.fit(S)
+    qtdmri_fit_lap = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order,
+        laplacian_regularization=True, laplacian_weighting=1e-4)
     fitted_signal = qtdmri_fit_lap.fitted_signal()
     E_q0_first_tau = fitted_signal[
         np.all([tau == tau.min(), gtab_4d.b0s_mask], axis=0)
@@ -421,16 +432,14 @@ def test_q0_constraint_and_unity_of_ODFs(radial_order=6, time_order=2):
         print('missing spherical harmonics cartesian ODF caught.')
 
     # now with cvxpy regularization spherical
-    qtdmri_mod_lap = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        laplacian_regularization=True, laplacian_weighting=1e-4,
-        cartesian=False
-    )
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
-        qtdmri_fit_lap = qtdmri_mod_lap.fit(S)
+        qtdmri_fit_lap = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            laplacian_regularization=True, laplacian_weighting=1e-4,
+            cartesian=False)
         fitted_signal = qtdmri_fit_lap.fitted_signal()
     E_q0_first_tau = fitted_signal[
         np.all([tau == tau.min(), gtab_4d.b0s_mask], axis=0)
@@ -450,22 +459,14 @@ def test_q0_constraint_and_unity_of_ODFs(radial_order=6, time_order=2):
 
 
 @needs_cvxpy
-def test_laplacian_reduces_laplacian_norm(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-
-    qtdmri_mod_no_laplacian = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        laplacian_regularization=True, laplacian_weighting=0.
-    )
-    qtdmri_mod_laplacian = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        laplacian_regularization=True, laplacian_weighting=1e-4
-    )
+def test_laplacian_reduces_laplacian_norm(radial_order=2, time_order=1):
+    S = data.S
 
-    qtdmri_fit_no_laplacian = qtdmri_mod_no_laplacian.fit(S)
-    qtdmri_fit_laplacian = qtdmri_mod_laplacian.fit(S)
+    qtdmri_fit_no_laplacian = get_unregularized_fit(
+        radial_order=radial_order, time_order=time_order)
+    qtdmri_fit_laplacian = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order,
+        laplacian_regularization=True, laplacian_weighting=1e-4)
 
     laplacian_norm_no_reg = qtdmri_fit_no_laplacian.norm_of_laplacian_signal()
     laplacian_norm_reg = qtdmri_fit_laplacian.norm_of_laplacian_signal()
@@ -474,28 +475,21 @@ def test_laplacian_reduces_laplacian_norm(radial_order=4, time_order=2):
 
 
 @needs_cvxpy
-def test_spherical_laplacian_reduces_laplacian_norm(radial_order=4,
-                                                    time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-
-    qtdmri_mod_no_laplacian = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        cartesian=False, laplacian_regularization=True, laplacian_weighting=0.
-    )
-    qtdmri_mod_laplacian = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        cartesian=False, laplacian_regularization=True,
-        laplacian_weighting=1e-4
-    )
+def test_spherical_laplacian_reduces_laplacian_norm(radial_order=2,
+                                                    time_order=1):
+    S = data.S
 
     with warnings.catch_warnings():
         warnings.filterwarnings(
             "ignore", message=descoteaux07_legacy_msg,
             category=PendingDeprecationWarning)
-        qtdmri_fit_no_laplacian = qtdmri_mod_no_laplacian.fit(S)
-        qtdmri_fit_laplacian = qtdmri_mod_laplacian.fit(S)
+        qtdmri_fit_no_laplacian = get_unregularized_fit(
+            radial_order=radial_order, time_order=time_order,
+            cartesian=False)
+        qtdmri_fit_laplacian = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            cartesian=False, laplacian_regularization=True,
+            laplacian_weighting=1e-4)
 
     laplacian_norm_no_reg = qtdmri_fit_no_laplacian.norm_of_laplacian_signal()
     laplacian_norm_reg = qtdmri_fit_laplacian.norm_of_laplacian_signal()
@@ -503,41 +497,15 @@ def test_spherical_laplacian_reduces_laplacian_norm(radial_order=4,
     assert_(laplacian_norm_no_reg > laplacian_norm_reg)
 
 
-@needs_cvxpy
-def test_laplacian_GCV_higher_weight_with_noise(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-    S_noise = add_noise(S, S0=1., snr=10)
-
-    qtdmri_mod_laplacian_GCV = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        laplacian_regularization=True, laplacian_weighting="GCV"
-    )
-
-    qtdmri_fit_no_noise = qtdmri_mod_laplacian_GCV.fit(S)
-    qtdmri_fit_noise = qtdmri_mod_laplacian_GCV.fit(S_noise)
-
-    assert_(qtdmri_fit_noise.lopt > qtdmri_fit_no_noise.lopt)
-
-
 @needs_cvxpy
 def test_l1_increases_sparsity(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
+    S = data.S
 
-    qtdmri_mod_no_l1 = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        l1_regularization=True, l1_weighting=0.
-    )
-    qtdmri_mod_l1 = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        l1_regularization=True, l1_weighting=.1
-    )
-
-    qtdmri_fit_no_l1 = qtdmri_mod_no_l1.fit(S)
-    qtdmri_fit_l1 = qtdmri_mod_l1.fit(S)
+    qtdmri_fit_no_l1 = get_unregularized_fit(
+        radial_order=radial_order, time_order=time_order)
+    qtdmri_fit_l1 = get_qtdmri_fit(
+        S, radial_order=radial_order, time_order=time_order,
+        l1_regularization=True, l1_weighting=.1)
 
     sparsity_abs_no_reg = qtdmri_fit_no_l1.sparsity_abs()
     sparsity_abs_reg = qtdmri_fit_l1.sparsity_abs()
@@ -549,21 +517,8 @@ def test_l1_increases_sparsity(radial_order=4, time_order=2):
 
 
 @needs_cvxpy
-def test_spherical_l1_increases_sparsity(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-
-    qtdmri_mod_no_l1 = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        l1_regularization=True, cartesian=False, normalization=True,
-        l1_weighting=0.
-    )
-    qtdmri_mod_l1 = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        l1_regularization=True, cartesian=False, normalization=True,
-        l1_weighting=.1
-    )
+def test_spherical_l1_increases_sparsity(radial_order=2, time_order=1):
+    S = data.S
 
     with warnings.catch_warnings():
         warnings.filterwarnings(
@@ -575,8 +530,13 @@ def test_spherical_l1_increases_sparsity(radial_order=4, time_order=2):
         warnings.filterwarnings(
             "ignore", message="Solution may be inaccurate..*",
             category=UserWarning)
-        qtdmri_fit_no_l1 = qtdmri_mod_no_l1.fit(S)
-        qtdmri_fit_l1 = qtdmri_mod_l1.fit(S)
+        qtdmri_fit_no_l1 = get_unregularized_fit(
+            radial_order=radial_order, time_order=time_order,
+            cartesian=False, normalization=True)
+        qtdmri_fit_l1 = get_qtdmri_fit(
+            S, radial_order=radial_order, time_order=time_order,
+            l1_regularization=True, cartesian=False, normalization=True,
+            l1_weighting=.1)
 
     sparsity_abs_no_reg = qtdmri_fit_no_l1.sparsity_abs()
     sparsity_abs_reg = qtdmri_fit_l1.sparsity_abs()
@@ -588,33 +548,32 @@ def test_spherical_l1_increases_sparsity(radial_order=4, time_order=2):
 
 
 @needs_cvxpy
-def test_l1_CV(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-    S_noise = add_noise(S, S0=1., snr=10)
-    qtdmri_mod_l1_cv = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        l1_regularization=True, l1_weighting="CV"
-    )
-    qtdmri_fit_noise = qtdmri_mod_l1_cv.fit(S_noise)
-    assert_(qtdmri_fit_noise.alpha >= 0)
-
+@pytest.mark.parametrize("regularization, weights_higher_with_noise", [
+    (dict(laplacian_regularization=True, laplacian_weighting="GCV"),
+     ["lopt"]),
+    (dict(l1_regularization=True, l1_weighting="CV"),
+     ["alpha"]),
+    # the elastic net alpha is chosen after lopt and varies with the random
+    # cross-validation splits too much to be compared reliably
+    (dict(laplacian_regularization=True, laplacian_weighting="GCV",
+          l1_regularization=True, l1_weighting="CV"),
+     ["lopt"]),
+])
+def test_weight_selection_with_noise(regularization,
+                                     weights_higher_with_noise,
+                                     radial_order=2, time_order=1):
+    qtdmri_fit_no_noise = get_qtdmri_fit(
+        data.S, radial_order=radial_order, time_order=time_order,
+        **regularization)
+    qtdmri_fit_noise = get_qtdmri_fit(
+        data.S_noise, radial_order=radial_order, time_order=time_order,
+        **regularization)
 
-@needs_cvxpy
-def test_elastic_GCV_CV(radial_order=4, time_order=2):
-    gtab_4d = generate_gtab4D()
-    l1, l2, l3 = [0.0015, 0.0003, 0.0003]
-    S = generate_signal_crossing(gtab_4d, l1, l2, l3)
-    S_noise = add_noise(S, S0=1., snr=10)
-    qtdmri_mod_elastic = qtdmri.QtdmriModel(
-        gtab_4d, radial_order=radial_order, time_order=time_order,
-        l1_regularization=True, l1_weighting="CV",
-        laplacian_regularization=True, laplacian_weighting="GCV"
-    )
-    qtdmri_fit_noise = qtdmri_mod_elastic.fit(S_noise)
     assert_(qtdmri_fit_noise.lopt >= 0)
     assert_(qtdmri_fit_noise.alpha >= 0)
+    for weight in weights_higher_with_noise:
+        assert_(getattr(qtdmri_fit_noise, weight) >
+                getattr(qtdmri_fit_no_noise, weight))
 
 
 @pytest.mark.skipif(not qtdmri.have_plt, reason="Requires Matplotlib")